@@ -1,42 +1,225 @@
-from datetime import datetime
+import atexit
 import os
+import queue
 import sys
+import threading
+import time
 
 #
 
+_fmt = "%Y-%m-%d %H:%M:%S"
+_FILE_BUFFER_SIZE = 64 * 1024
+_FLUSH_EVERY_N_LINES = 50
+_FLUSH_EVERY_X_SECONDS = 1.0
+_STOP_WRITER = object()
+
+
 class CsLog:
-    body = ''
     log_file_path = None
 
-    def __init__(self, initial_body='', log_file_path=None):
-        self.body = initial_body
+    # Timestamp cache shared by all instances; lines logged within the same
+    # wall-clock second reuse the already formatted string.
+    # Kept as one (second, string) tuple so a concurrent reader never sees
+    # a second paired with the string of another one.
+    _cached_stamp = (None, '')
+
+    @classmethod
+    def _timestamp(cls) -> str:
+        int_t = int(time.time())
+        cached_sec, cached_str = cls._cached_stamp
+        if int_t != cached_sec:
+            cached_str = time.strftime(_fmt, time.localtime(int_t))
+            cls._cached_stamp = (int_t, cached_str)
+        return cached_str
+
+    def __init__(self, initial_body='', log_file_path=None, debug_enabled=False):
+        # Lines are kept once, individually (without trailing newline), so
+        # get_new_lines()/get_tail() are plain slices; the full body is only
+        # joined on demand and cached until the next append.
+        self._lines: list[str] = []
+        self._line_count: int = 0
+        self._body_cache = ''
+        # Keeps _lines, _line_count and the body cache consistent across threads
+        self._lock = threading.Lock()
         self.log_file_path = log_file_path
+        self.debug_enabled = debug_enabled
 
         #log_file_path = handler_for_file_system.build_sattelite_file_path(log_file_path)
         #self.log_file_path = log_file_path
 
+        # The log file is opened once and owned by a background writer thread:
+        # add_line only enqueues, the writer drains everything pending into one
+        # write() and flushes every few lines/seconds and on close/exit.
+        # After close() lines are appended to the file synchronously.
+        self._fh = None
+        self._queue = None
+        self._writer = None
+        if self.log_file_path:
+            self._fh = open(self.log_file_path, 'a', buffering=_FILE_BUFFER_SIZE)
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._write_loop, name='CsLogWriter', daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
         # Only add initial_body if it's not empty, and properly format it
         if initial_body:
-            line = f'{datetime.now().strftime("%Y-%m-%d %H:%M:%S")} {initial_body}'
-            self.body = line + '\n'
-            print(line)
-            if self.log_file_path:
-                with open(self.log_file_path, 'a') as log_file:
-                    log_file.write(line + '\n')
+            self.add_line(initial_body)
+
+    @property
+    def body(self) -> str:
+        with self._lock:
+            body = self._body_cache
+            if body is None:
+                body = '\n'.join(self._lines) + '\n' if self._lines else ''
+                self._body_cache = body
+            return body
 
     def get_body(self):
         return self.body
 
-    def add_line(self, line: str):
-        line = f'{datetime.now().strftime("%Y-%m-%d %H:%M:%S")} {line}'
+    @property
+    def lines_count(self) -> int:
+        """Number of lines added so far; cheap to poll before calling get_new_lines()."""
+        return self._line_count
 
-        self.body += line+'\n'
+    def add_line(self, line: str):
+        line = f'{self._timestamp()} {line}'
+
+        with self._lock:
+            self._lines.append(line)
+            self._line_count += 1
+            self._body_cache = None
+            line += '\n'
+            self._write_to_file(line)
+
+        stdout = sys.stdout
+        if stdout is not None:
+            stdout.write(line)
+
+    def add_lines(self, lines):
+        """Add several lines at once: one lock acquisition, one console write and one queued file write."""
+        stamp = self._timestamp()
+        lines = [f'{stamp} {line}' for line in lines]
+        if not lines:
+            return
+        text = '\n'.join(lines) + '\n'
+
+        with self._lock:
+            self._lines.extend(lines)
+            self._line_count += len(lines)
+            self._body_cache = None
+            self._write_to_file(text)
+
+        stdout = sys.stdout
+        if stdout is not None:
+            stdout.write(text)
+
+    def _write_to_file(self, text: str):
+        """Queue text for the writer thread, or append it directly once the log was closed (caller holds _lock)."""
+        q = self._queue
+        if q is not None:
+            q.put(text)
+        elif self.log_file_path:
+            with open(self.log_file_path, 'a') as log_file:
+                log_file.write(text)
 
-        print(line)
+    def debug(self, fmt: str, *args):
+        """Add a verbose line, formatted ``fmt % args``, only when debug logging is enabled.
 
-        if self.log_file_path:
-            with open(self.log_file_path, 'a') as log_file:
-                log_file.write(line+'\n')
+        Formatting is deferred so disabled debug lines cost a single attribute check.
+        """
+        if not self.debug_enabled:
+            return
+        self.add_line(fmt % args if args else fmt)
+
+    def _write_loop(self):
+        """Background writer: batch queued lines into single writes to the log file."""
+        fh = self._fh
+        q = self._queue
+        unflushed_lines = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = q.get(timeout=_FLUSH_EVERY_X_SECONDS)
+            except queue.Empty:
+                if unflushed_lines:
+                    fh.flush()
+                    unflushed_lines = 0
+                    last_flush = time.monotonic()
+                continue
+
+            # Drain whatever else piled up meanwhile
+            batch = []
+            flush_requests = []
+            stop = False
+            while True:
+                if item is _STOP_WRITER:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flush_requests.append(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    fh.write(''.join(batch))
+                    unflushed_lines += len(batch)
+                if (stop or flush_requests or unflushed_lines >= _FLUSH_EVERY_N_LINES
+                        or time.monotonic() - last_flush >= _FLUSH_EVERY_X_SECONDS):
+                    fh.flush()
+                    unflushed_lines = 0
+                    last_flush = time.monotonic()
+            except Exception as exc:
+                stderr = sys.stderr
+                if stderr is not None:
+                    stderr.write(f'CsLog: failed to write log file: {exc}\n')
+            finally:
+                for flushed in flush_requests:
+                    flushed.set()
+            if stop:
+                return
+
+    def flush(self):
+        """Block until every line added so far has been written to the log file."""
+        with self._lock:
+            q = self._queue
+            if q is None:
+                return
+            flushed = threading.Event()
+            q.put(flushed)
+        flushed.wait()
+
+    def close(self):
+        """Flush and close the log file. Lines added afterwards are appended to it synchronously."""
+        # Held until the writer is done, so no line can be queued behind _STOP_WRITER
+        # or written directly ahead of lines still in the queue
+        with self._lock:
+            q, writer, fh = self._queue, self._writer, self._fh
+            if q is None:
+                return
+            self._queue = None
+            q.put(_STOP_WRITER)
+            writer.join()
+            self._writer = None
+            self._fh = None
+            fh.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def get_tail(self, max_lines: int = 200) -> str:
+        """Return the last max_lines lines as one newline-terminated string."""
+        if max_lines <= 0:
+            return ''
+        tail = self._lines[-max_lines:]
+        return '\n'.join(tail) + '\n' if tail else ''
 
     def get_new_lines(self, already_shown: int):
         """
@@ -52,16 +235,10 @@ class CsLog:
         list[str]
             A list with all lines that were added after the index.
         """
-        # Split the current body into individual lines
-        lines = self.body.rstrip('\n').split('\n')
-
         # Guard against negative indexes and out-of-range values
-        if already_shown < 0:
-            already_shown = 0
-        if already_shown >= len(lines):
-            return []
+        already_shown = max(0, min(already_shown, self._line_count))
 
-        return lines[already_shown:]
+        return self._lines[already_shown:self._line_count]
 
 # Example usage
 if __name__ == "__main__":
@@ -1,10 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
 import os
 import platform
-from datetime import datetime
+import shutil
 import threading
 import time
 
 
+_IS_ANDROID = platform.system() == 'Linux' and 'ANDROID_ARGUMENT' in os.environ
+
+# Kivy's Clock is only needed to hop onto the UI thread on Android; importing it
+# once here keeps the per-capture paths free of import machinery.
+if _IS_ANDROID:
+    try:
+        from kivy.clock import Clock as _Clock
+    except Exception:  # pragma: no cover – broken Kivy install
+        _Clock = None
+else:
+    _Clock = None
+
+# In-kernel file copy (Linux, Python 3.8+). Not used on Android where seccomp
+# filters on older releases kill the process for unknown syscalls.
+_copy_file_range = None if _IS_ANDROID else getattr(os, 'copy_file_range', None)
+
+# Pyjnius autoclass() does a JNI FindClass plus a reflection scan on every call,
+# so resolved Java classes are memoized for the lifetime of the process.
+_jclass_cache = {}
+
+
+def _jclass(name: str):
+    """Return the Pyjnius proxy class for the given Java class name, resolving it only once."""
+    c = _jclass_cache.get(name)
+    if c is None:
+        from jnius import autoclass  # type: ignore  # imported lazily to keep desktop path clean
+        c = autoclass(name)
+        _jclass_cache[name] = c
+    return c
+
+
 class CameraHandler:
     """Handle photo capture on Android using the native Camera API via Pyjnius.
 
@@ -12,12 +44,38 @@ class CameraHandler:
     is created so the rest of the pipeline can continue to operate.
     """
 
-    def __init__(self, photo_folder_path: str, logger, wait_x_seconds_on_ui_capture=60):
+    __slots__ = ('logger', 'photo_folder_path_setting', 'is_android', 'photo_folder_path',
+                 'wait_x_seconds_on_ui_capture', 'reencode_captured_photo', '_filename_prefix',
+                 '_dummy_src', '_dummy_fd', '_dummy_size', '_capture_waiters', '_capture_waiters_lock', '_executor',
+                 '_picture_size')
+
+    def __init__(self, photo_folder_path: str, logger, wait_x_seconds_on_ui_capture=60, reencode_captured_photo=False):
         self.logger = logger
         self.photo_folder_path_setting = photo_folder_path
-        self.is_android = platform.system() == 'Linux' and 'ANDROID_ARGUMENT' in os.environ
+        self.is_android = _IS_ANDROID
         self.photo_folder_path = self._resolve_photo_folder_path()
         self.wait_x_seconds_on_ui_capture = wait_x_seconds_on_ui_capture
+        self.reencode_captured_photo = reencode_captured_photo
+        self._filename_prefix = os.path.join(self.photo_folder_path, 'DroidEye_')
+        self._dummy_src = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dummy.jpg')
+        # Keep dummy.jpg open so desktop captures can copy it fully in-kernel
+        self._dummy_fd = None
+        self._dummy_size = 0
+        if _copy_file_range is not None:
+            try:
+                self._dummy_fd = os.open(self._dummy_src, os.O_RDONLY)
+                self._dummy_size = os.fstat(self._dummy_fd).st_size
+            except OSError:
+                self._dummy_fd = None
+        # filename -> [Event, file size] for every capture_photo_sync in flight.
+        # The capture paths set only the entry of the file they wrote, so
+        # overlapping synchronous captures never wake or overwrite each other.
+        self._capture_waiters = {}
+        self._capture_waiters_lock = threading.Lock()
+        # Reused worker threads for desktop dummy captures
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='DroidEyeCapture')
+        # (width, height) picked on the first Android capture, see _capture_android
+        self._picture_size = None
         os.makedirs(self.photo_folder_path, exist_ok=True)
         self.logger.add_line(f'Photo folder resolved to: {self.photo_folder_path}')
 
@@ -47,65 +105,112 @@ class CameraHandler:
         * On Android  -> uses Pyjnius to invoke the platform Camera API on the UI thread.
         * Elsewhere  -> immediately creates a dummy file.
         """
+        is_android = self.is_android
         filename = self._build_filename(photo_id)
 
-        if self.is_android:
+        if is_android:
             # Calling directly keeps us on the main Kivy/Python thread which is already
             # attached to the JVM, avoiding PyJNIus thread-hook issues (missing
             # NativeInvocationHandler on secondary threads).
-            from kivy.clock import Clock  # imported lazily to keep desktop path clean
             self.logger.add_line(f'Scheduling Android camera capture to "{filename}" on UI thread')
-            Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
+            _Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
         else:
             self.logger.add_line(f'Non-Android environment – creating dummy photo "{filename}"')
-            threading.Thread(target=self._create_dummy_file, args=(filename,), daemon=True).start()
+            self._executor.submit(self._create_dummy_file, filename)
 
     def capture_photo_sync(self, photo_id: str, timeout: int = None):
+        is_android = self.is_android
         filename = self._build_filename(photo_id)
         if timeout is None:
             timeout = self.wait_x_seconds_on_ui_capture
         self.logger.add_line(f'Starting synchronous capture for {filename} with timeout {timeout}s')
         self.push_app_to_foreground()
-        # Remove file if it exists
+        # Register before scheduling so a fast capture cannot finish unnoticed
+        with self._capture_waiters_lock:
+            waiter = self._capture_waiters.setdefault(filename, [threading.Event(), 0])
+        # Remove file if it exists (a missing file is the common case)
         try:
-            if os.path.exists(filename):
-                os.remove(filename)
-        except Exception:
+            os.remove(filename)
+        except OSError:
             pass
         # Schedule capture
-        if self.is_android:
-            from kivy.clock import Clock
-            Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
+        if is_android:
+            _Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
         else:
-            threading.Thread(target=self._create_dummy_file, args=(filename,), daemon=True).start()
-        # Wait for file to appear
-        start = time.time()
-        while time.time() - start < timeout:
-            if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                file_size = os.path.getsize(filename)
-                return True, filename, file_size, ''
-            time.sleep(0.2)
+            self._executor.submit(self._create_dummy_file, filename)
+        # Wait for the capture to report the file as written
+        try:
+            if waiter[0].wait(timeout):
+                return True, filename, waiter[1], ''
+        finally:
+            with self._capture_waiters_lock:
+                if self._capture_waiters.get(filename) is waiter:
+                    del self._capture_waiters[filename]
         # Timeout
         self.logger.add_line('Capture timed out waiting for file.')
         return False, filename, 0, 'DroidEye is not open as foreground app on android phone'
 
+    def close(self):
+        """Release the worker threads and file descriptor used for dummy captures."""
+        self._executor.shutdown(wait=False)
+        if self._dummy_fd is not None:
+            os.close(self._dummy_fd)
+            self._dummy_fd = None
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
     def _build_filename(self, photo_id: str) -> str:
-        ts = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        return os.path.join(self.photo_folder_path, f'DroidEye_{ts}_{photo_id}.jpg')
+        ts = time.strftime('%Y-%m-%d_%H-%M-%S')
+        return f'{self._filename_prefix}{ts}_{photo_id}.jpg'
+
+    def _notify_capture_done(self, filename: str):
+        """Wake up capture_photo_sync once filename exists and is not empty."""
+        try:
+            file_size = os.stat(filename).st_size
+        except OSError:
+            return
+        if file_size > 0:
+            with self._capture_waiters_lock:
+                waiter = self._capture_waiters.get(filename)
+            if waiter is not None:
+                waiter[1] = file_size
+                waiter[0].set()
+
+    def _copy_dummy_in_kernel(self, filename: str) -> bool:
+        """Copy the pre-opened dummy.jpg with copy_file_range(2); False if unavailable/failed."""
+        src_fd = self._dummy_fd
+        if src_fd is None:
+            return False
+        size = self._dummy_size
+        dst_fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            copied = 0
+            while copied < size:
+                # Explicit source offset leaves the shared fd's position untouched
+                n = _copy_file_range(src_fd, dst_fd, size - copied, copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            # e.g. cross-filesystem copy on older kernels – let shutil handle it
+            return False
+        finally:
+            os.close(dst_fd)
+        return copied == size
 
     def _create_dummy_file(self, filename: str):
         self.logger.add_line(f'Creating dummy photo file: {filename}')
         try:
             # Copy dummy.jpg from the app directory to the target filename
-            src = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dummy.jpg')
-            if not os.path.exists(src):
-                raise FileNotFoundError(f'dummy.jpg not found at {src}')
-            with open(src, 'rb') as fsrc, open(filename, 'wb') as fdst:
-                fdst.write(fsrc.read())
+            # (both paths use the kernel's zero-copy path where available)
+            src = self._dummy_src
+            if not self._copy_dummy_in_kernel(filename):
+                if not os.path.exists(src):
+                    raise FileNotFoundError(f'dummy.jpg not found at {src}')
+                shutil.copyfile(src, filename)
             self.logger.add_line(f'Dummy photo file copied from {src} to: {filename}')
+            self._notify_capture_done(filename)
         except Exception as exc:
             self.logger.add_line(f'Failed to copy dummy photo file: {exc}')
 
@@ -118,13 +223,11 @@ class CameraHandler:
         if not self.is_android:
             return
         try:
-            from jnius import autoclass, cast
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
+            from jnius import cast
+            PythonActivity = _jclass('org.kivy.android.PythonActivity')
             activity = PythonActivity.mActivity
-            Context = autoclass('android.content.Context')
-            Intent = autoclass('android.content.Intent')
-            PackageManager = autoclass('android.content.pm.PackageManager')
-            ActivityManager = autoclass('android.app.ActivityManager')
+            Context = _jclass('android.content.Context')
+            Intent = _jclass('android.content.Intent')
 
             pkg_name = activity.getPackageName()
             pm = activity.getPackageManager()
@@ -159,6 +262,7 @@ class CameraHandler:
         Java UI thread via the `run_on_ui_thread` decorator provided by Kivy.
         """
         logger = self.logger
+        handler = self
 
         # --------------------------------------------------------------
         # Ensure CAMERA runtime permission (Android 6+)
@@ -176,8 +280,7 @@ class CameraHandler:
                 def _perm_callback(_permissions, grants):  # pylint: disable=unused-argument
                     if all(grants):
                         logger.add_line("CAMERA permission granted – retrying capture")
-                        from kivy.clock import Clock  # local import to avoid desktop breakage
-                        Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
+                        _Clock.schedule_once(lambda *_: self._capture_android(filename), 0)
                     else:
                         logger.add_line("CAMERA permission denied by user – creating dummy file")
                         self._create_dummy_file(filename)
@@ -192,8 +295,9 @@ class CameraHandler:
         # Import Android-specific dependencies lazily so desktop imports don't explode.
         try:
             from android.runnable import run_on_ui_thread  # type: ignore
-            from jnius import autoclass, PythonJavaClass, java_method  # type: ignore
-            from kivy.clock import Clock  # type: ignore
+            from jnius import PythonJavaClass, java_method  # type: ignore
+            if _Clock is None:
+                raise ImportError('kivy.clock is not available')
         except Exception as exc:  # pragma: no cover – only hit on non-Android.
             logger.add_line(f"Android camera dependencies not available: {exc}. Creating dummy file instead.")
             self._create_dummy_file(filename)
@@ -201,8 +305,8 @@ class CameraHandler:
 
         # Grab the requisite Java classes.
         try:
-            Camera = autoclass('android.hardware.Camera')
-            SurfaceTexture = autoclass('android.graphics.SurfaceTexture')
+            Camera = _jclass('android.hardware.Camera')
+            SurfaceTexture = _jclass('android.graphics.SurfaceTexture')
         except Exception as exc:
             logger.add_line(f"Failed to access Android Camera classes: {exc}")
             self._create_dummy_file(filename)
@@ -211,6 +315,31 @@ class CameraHandler:
         # ------------------------------------------------------------------
         # Define the PictureCallback wrapper
         # ------------------------------------------------------------------
+        def _save_reencoded(data) -> bool:
+            """Decode the JPEG and re-encode it at 100% quality. Opt-in via reencode_captured_photo."""
+            try:
+                BitmapFactory = _jclass('android.graphics.BitmapFactory')
+                CompressFormat = _jclass('android.graphics.Bitmap$CompressFormat')
+                FileOutputStream = _jclass('java.io.FileOutputStream')
+                bitmap = BitmapFactory.decodeByteArray(data, 0, len(data))
+                if bitmap is None:
+                    logger.add_line(f'BitmapFactory.decodeByteArray failed, saving camera JPEG as-is for {filename}')
+                    return False
+                fos = FileOutputStream(filename)
+                try:
+                    success = bitmap.compress(CompressFormat.JPEG, 100, fos)
+                finally:
+                    fos.close()
+                    bitmap.recycle()
+                if not success:
+                    logger.add_line(f'Bitmap.compress failed, saving camera JPEG as-is for {filename}')
+                    return False
+                logger.add_line(f'Photo saved (re-encoded JPEG 100%): {filename}')
+                return True
+            except Exception as bitmap_exc:  # noqa: BLE001
+                logger.add_line(f'Bitmap/JPEG 100% save failed: {bitmap_exc}, saving camera JPEG as-is for {filename}')
+                return False
+
         class JpegCallback(PythonJavaClass):
             """Receives the JPEG byte[] from Android and writes it to disk."""
 
@@ -222,40 +351,27 @@ class CameraHandler:
 
             @java_method('([BLandroid/hardware/Camera;)V')
             def onPictureTaken(self, data, camera):  # pylint: disable=invalid-name
-                logger.add_line(f'Camera callback: received image data, saving to {filename} (100% quality)')
+                logger.debug('Camera callback: received image data, saving to %s', filename)
                 try:
-                    # Try to use Android Bitmap to re-encode at 100% quality
-                    try:
-                        from jnius import autoclass
-                        BitmapFactory = autoclass('android.graphics.BitmapFactory')
-                        Bitmap = autoclass('android.graphics.Bitmap')
-                        CompressFormat = autoclass('android.graphics.Bitmap$CompressFormat')
-                        FileOutputStream = autoclass('java.io.FileOutputStream')
-
-                        py_bytes = bytes(data)
-                        bitmap = BitmapFactory.decodeByteArray(py_bytes, 0, len(py_bytes))
-                        if bitmap is not None:
+                    # By default the camera JPEG is stored as-is with FileOutputStream, no
+                    # decode/re-encode. This is not zero-copy: Pyjnius copies the byte[]
+                    # into its ByteArray and back into a new Java array for write(); it
+                    # only skips building a Python bytes object on top of that.
+                    if not (handler.reencode_captured_photo and _save_reencoded(data)):
+                        try:
+                            FileOutputStream = _jclass('java.io.FileOutputStream')
                             fos = FileOutputStream(filename)
-                            success = bitmap.compress(CompressFormat.JPEG, 100, fos)
-                            fos.close()
-                            if success:
-                                logger.add_line(f'Photo saved (JPEG 100%): {filename}')
-                            else:
-                                logger.add_line(f'Bitmap.compress failed, falling back to raw bytes for {filename}')
-                                with open(filename, 'wb') as fh:
-                                    fh.write(py_bytes)
-                                logger.add_line(f'Photo saved (raw fallback): {filename}')
-                        else:
-                            logger.add_line(f'BitmapFactory.decodeByteArray failed, saving raw bytes for {filename}')
+                            try:
+                                fos.write(data)
+                            finally:
+                                fos.close()
+                            logger.add_line(f'Photo saved: {filename}')
+                        except Exception as java_exc:
+                            logger.add_line(f'FileOutputStream save failed: {java_exc}, saving raw bytes for {filename}')
                             with open(filename, 'wb') as fh:
-                                fh.write(py_bytes)
+                                fh.write(bytes(data))
                             logger.add_line(f'Photo saved (raw fallback): {filename}')
-                    except Exception as bitmap_exc:
-                        logger.add_line(f'Bitmap/JPEG 100% save failed: {bitmap_exc}, saving raw bytes for {filename}')
-                        py_bytes = bytes(data)
-                        with open(filename, 'wb') as fh:
-                            fh.write(py_bytes)
-                        logger.add_line(f'Photo saved (raw fallback): {filename}')
+                    handler._notify_capture_done(filename)
                 except Exception as exc_inner:  # noqa: BLE001
                     logger.add_line(f'Failed to save photo: {exc_inner}')
                 finally:
@@ -270,7 +386,7 @@ class CameraHandler:
 
         @run_on_ui_thread
         def _java_capture():  # noqa: D401, N802 – Android API naming conventions.
-            logger.add_line(f'Android UI thread: opening camera for {filename}')
+            logger.debug('Android UI thread: opening camera for %s', filename)
             # First try to obtain the camera instance separately so we can
             # handle connection failures cleanly.
             cam_instance = None
@@ -278,7 +394,6 @@ class CameraHandler:
                 cam_instance = Camera.open(0)
             except Exception as open_exc:  # noqa: BLE001
                 logger.add_line(f"Android UI thread: Camera.open failed: {open_exc}. Will retry once after 0.5 s")
-                from kivy.clock import Clock  # noqa: WPS433
 
                 def _retry(_):
                     try:
@@ -289,18 +404,26 @@ class CameraHandler:
                         logger.add_line(f"Android UI thread: Second Camera.open failed: {exc_retry}. Creating dummy file.")
                         self._create_dummy_file(filename)
 
-                Clock.schedule_once(_retry, 0.5)
+                _Clock.schedule_once(_retry, 0.5)
                 return
 
             # If we reach here we have a valid camera instance.
-            logger.add_line(f'Android UI thread: Camera opened, configuring and starting preview for {filename}')
+            logger.debug('Android UI thread: Camera opened, configuring and starting preview for %s', filename)
             try:
                 params = cam_instance.getParameters()
-                sizes = params.getSupportedPictureSizes()
-                if sizes and len(sizes):
-                    best_size = max(sizes, key=lambda s: s.width * s.height)
-                    params.setPictureSize(best_size.width, best_size.height)
+                # The supported sizes of camera 0 do not change, so the largest one
+                # is looked up on the first capture only and reused afterwards.
+                picture_size = self._picture_size
+                if picture_size is None:
+                    sizes = params.getSupportedPictureSizes()
+                    if sizes and len(sizes):
+                        # Read each size's fields over JNI exactly once, then compare in Python
+                        sizes_py = [(s.width, s.height) for s in sizes]
+                        picture_size = max(sizes_py, key=lambda t: t[0] * t[1])
+                if picture_size is not None:
+                    params.setPictureSize(*picture_size)
                     cam_instance.setParameters(params)
+                    self._picture_size = picture_size
             except Exception:  # pylint: disable=broad-except
                 pass  # Use default params if anything goes wrong
 
@@ -308,7 +431,7 @@ class CameraHandler:
                 dummy_surface = SurfaceTexture(0)
                 cam_instance.setPreviewTexture(dummy_surface)
                 cam_instance.startPreview()
-                logger.add_line(f'Android UI thread: Starting camera preview and taking picture for {filename}')
+                logger.debug('Android UI thread: Starting camera preview and taking picture for %s', filename)
                 cam_instance.takePicture(None, None, JpegCallback())
             except Exception as exc_take:  # noqa: BLE001
                 logger.add_line(f"Android UI thread: camera capture error: {exc_take}")
@@ -316,8 +439,7 @@ class CameraHandler:
                     cam_instance.release()
                 except Exception:  # pylint: disable=broad-except
                     pass
-                from kivy.clock import Clock as _KClock  # local import to avoid desktop errors
-                _KClock.schedule_once(lambda *_: self._create_dummy_file(filename), 0)
+                _Clock.schedule_once(lambda *_: self._create_dummy_file(filename), 0)
 
         # Kick off the Java-side capture.
         _java_capture()
\ No newline at end of file
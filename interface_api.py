@@ -1,8 +1,115 @@
+from collections import OrderedDict
+import binascii
+import configparser
+import functools
+import mimetypes
+import mmap
+import os
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import urlparse, parse_qs
-import json
-import html
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote_plus
+
+# Kivy is only used to notify the GUI about capture results
+try:
+    from kivy.app import App
+    from kivy.clock import Clock
+except ImportError:
+    App = None
+    Clock = None
+
+# orjson is optional: it returns UTF-8 bytes directly and is much faster than
+# stdlib json, which is used as a fallback (e.g. in builds without it).
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        # Compact separators, same output shape as orjson
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+# Pre-encoded response skeletons: constant keys are spliced in as bytes and only
+# the free-form string fields go through the JSON encoder.
+_CAPTURE_TMPL = (b'{"has_error":%s,"message":%s,"id":%s,"file_size_in_bytes":%d,'
+                 b'"file_path":%s,"log":%s}')
+_CHUNK_TMPL = (b'{"has_error":%s,"message":%s,"id":%s,"file_size_in_bytes":%d,'
+               b'"file_path":%s,"is_last_chunk":%s,"offset_in_bytes":%d,"chunk_size_in_bytes":%d,'
+               b'"chunk_body_as_base64":"%s","log":%s}')
+
+
+def _parse_single(qs: str, key: str, default: str) -> str:
+    """Return the first non-blank value of key in query string qs, like parse_qs(qs).get(key, [default])[0].
+
+    Scans the pairs once and stops at the first match instead of building a dict of lists.
+    """
+    for pair in qs.split('&'):
+        name, _, value = pair.partition('=')
+        if value and unquote_plus(name) == key:
+            return unquote_plus(value)
+    return default
+
+
+def _parse_uint(raw: str, default: int) -> int:
+    """Return raw as a non-negative int, or default if it is not a plain run of at most 18 digits.
+
+    isdecimal() rejects signs/whitespace (which int() would accept) and the length cap keeps
+    int() below its digit-count limit, so int() can never raise here.
+    """
+    return int(raw) if len(raw) <= 18 and raw.isdecimal() else default
+
+
+def _advise_sequential(fd, offset=0, length=0):
+    """Tell the kernel fd is read sequentially and (if length) that offset..offset+length is needed next.
+
+    Only a hint: silently skipped where posix_fadvise is unavailable (e.g. Windows/macOS).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if length:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+
+def _json_bool(value) -> bytes:
+    return b'true' if value else b'false'
+
+
+def _encode_capture_response(has_error, message, photo_id, file_size, file_path, log) -> bytes:
+    return _CAPTURE_TMPL % (_json_bool(has_error), _json_dumps(message), _json_dumps(photo_id), file_size,
+                            _json_dumps(file_path), _json_dumps(log))
+
+
+def _encode_chunk_response(has_error, message, photo_id, file_size, file_path, is_last_chunk,
+                           offset_in_bytes, chunk_size_in_bytes, chunk_body_as_base64: bytes, log) -> bytes:
+    # Base64 output never needs JSON escaping, so the chunk (ASCII bytes) is spliced in as-is
+    return _CHUNK_TMPL % (_json_bool(has_error), _json_dumps(message), _json_dumps(photo_id), file_size,
+                          _json_dumps(file_path), _json_bool(is_last_chunk), offset_in_bytes, chunk_size_in_bytes,
+                          chunk_body_as_base64, _json_dumps(log))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dummy_file_path(ini_path: str, ini_mtime_ns, default: str) -> str:
+    """Read dummy_file_path from the ini; keyed on its mtime so edits are picked up."""
+    config = configparser.ConfigParser()
+    config.read(ini_path)
+    return config['DEFAULT'].get('dummy_file_path', default)
+
+
+# Only the most recent log lines are returned in API responses
+_RESPONSE_LOG_LINES = 200
+
+# Number of photos kept memory-mapped for repeated chunked downloads
+_MMAP_CACHE_SIZE = 8
+
+# Idle kept-alive connections are dropped after this many seconds so they do not hold a server thread forever
+_KEEP_ALIVE_TIMEOUT_SECONDS = 30
 
 
 class ApiInterface:
@@ -12,6 +119,30 @@ class ApiInterface:
         self.port = port
         self.camera_handler = camera_handler
         self.logger = logger
+        # abs_file_path -> ((st_ino, st_mtime_ns, st_size), mmap), least recently used first
+        self._mmap_cache = OrderedDict()
+        self._mmap_lock = threading.Lock()
+        # Paths used by /get_img, resolved once instead of per request
+        self._ini_path = os.path.abspath('DroidEye.ini')
+        self._default_dummy_file_path = os.path.join(os.path.dirname(self._ini_path), 'dummy.jpg')
+        self._photo_folder = getattr(camera_handler, 'photo_folder_path', os.path.join(os.getcwd(), 'photos'))
+        self._abs_photo_folder = os.path.abspath(self._photo_folder)
+
+    def _is_in_photo_folder(self, abs_file_path: str) -> bool:
+        """Security check for the file endpoints: abs_file_path must lie below the photo folder."""
+        allowed_folder = self._abs_photo_folder
+        try:
+            return abs_file_path != allowed_folder and os.path.commonpath([abs_file_path, allowed_folder]) == allowed_folder
+        except ValueError:
+            # Paths on different drives (Windows)
+            return False
+
+    def _get_dummy_file_path(self) -> str:
+        try:
+            ini_mtime_ns = os.stat(self._ini_path).st_mtime_ns
+        except OSError:
+            ini_mtime_ns = None
+        return _load_dummy_file_path(self._ini_path, ini_mtime_ns, self._default_dummy_file_path)
 
     # ------------------------------------------------------------------
     # Public API
@@ -24,125 +155,176 @@ class ApiInterface:
         api_interface = self
 
         class RequestHandler(BaseHTTPRequestHandler):
+            # Every response carries Content-Length, so clients (like the GUI) can keep the connection open
+            protocol_version = 'HTTP/1.1'
+            timeout = _KEEP_ALIVE_TIMEOUT_SECONDS
+
             def do_GET(self):
                 try:
-                    parsed = urlparse(self.path)
-                    if parsed.path == '/capture':
-                        qs = parse_qs(parsed.query)
-                        photo_id = qs.get('id', ['no_id'])[0]
-                        logger.add_line(f'/capture request received with id={photo_id}')
-                        success, file_path, file_size, error_msg = camera_handler.capture_photo_sync(photo_id, timeout)
-                        has_error = not success
-                        message = 'Ok' if not has_error else error_msg
-                        log_body = logger.get_body()
-                        # Escape for JSON
-                        message_escaped = html.escape(message)
-                        log_escaped = html.escape(log_body)
-                        response = {
-                            'has_error': has_error,
-                            'message': message_escaped,
-                            'id': photo_id,  
-                            'file_size_in_bytes': file_size,
-                            'file_path': file_path,
-                            'log': log_escaped
-                        }
-                        response_bytes = json.dumps(response).encode('utf-8')
-                        # Log the response (limit to 500 chars)
-                        log_response = response_bytes[:500].decode('utf-8', errors='replace')
-                        logger.add_line(f'/capture response: {log_response}')
-                        self.send_response(200)
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(response_bytes)))
-                        self.end_headers()
-                        self.wfile.write(response_bytes)
-                        # Notify Kivy GUI about capture result
-                        try:
-                            from kivy.app import App
-                            from kivy.clock import Clock
-                            gui_app = App.get_running_app()
-                            if gui_app is not None:
-                                if success and hasattr(gui_app, 'notify_photo_captured'):
-                                    Clock.schedule_once(lambda _dt, p=file_path: gui_app.notify_photo_captured(p), 0)
-                                elif not success and hasattr(gui_app, 'notify_capture_failed'):
-                                    Clock.schedule_once(lambda _dt: gui_app.notify_capture_failed(), 0)
-                        except Exception as exc_notify:
-                            logger.add_line(f'Failed to notify GUI about capture result: {exc_notify}')
-                        # End GUI notification
-                    elif parsed.path == '/get_file_chunk':
-                        qs = parse_qs(parsed.query)
-                        photo_id = qs.get('id', ['no_id'])[0]
-                        file_path = qs.get('file_path', [''])[0]
-                        try:
-                            offset_in_bytes = int(qs.get('offset_in_bytes', ['0'])[0])
-                        except Exception:
-                            offset_in_bytes = 0
-                        try:
-                            chunk_size_in_bytes = int(qs.get('chunk_size_in_bytes', ['1048576'])[0])
-                        except Exception:
-                            chunk_size_in_bytes = 1048576
-                        logger.add_line(f'/get_file_chunk request: id={photo_id}, file_path={file_path}, offset={offset_in_bytes}, chunk_size={chunk_size_in_bytes}')
-                        response = api_interface.get_file_chunk_response(photo_id, file_path, offset_in_bytes, chunk_size_in_bytes)
-                        response_bytes = json.dumps(response).encode('utf-8')
-                        log_response = response_bytes[:500].decode('utf-8', errors='replace')
-                        logger.add_line(f'/get_file_chunk response: {log_response}')
+                    target = self.path
+                    if not target.startswith('/'):
+                        # Absolute-form target (GET http://host/path) – drop scheme and host
+                        target = '/' + target.partition('://')[2].partition('/')[2]
+                    path, _, query = target.partition('#')[0].partition('?')
+                    route = self._ROUTES.get(path)
+                    if route is None:
+                        self._send_plain(404)
+                        return
+                    route(self, query)
+                except Exception as exc:
+                    logger.add_line(f'Error handling request: {exc}')
+                    self._send_plain(500, b'Internal Server Error')
+
+            def _handle_capture(self, query):
+                photo_id = _parse_single(query, 'id', 'no_id')
+                logger.add_line(f'/capture request received with id={photo_id}')
+                success, file_path, file_size, error_msg = camera_handler.capture_photo_sync(photo_id, timeout)
+                has_error = not success
+                message = 'Ok' if not has_error else error_msg
+                response_bytes = _encode_capture_response(has_error, message, photo_id, file_size, file_path,
+                                                          logger.get_tail(_RESPONSE_LOG_LINES))
+                # Log the response (limit to 500 chars)
+                log_response = response_bytes[:500].decode('utf-8', errors='replace')
+                logger.add_line(f'/capture response: {log_response}')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(response_bytes)))
+                self.end_headers()
+                self.wfile.write(response_bytes)
+                # Notify Kivy GUI about capture result
+                try:
+                    gui_app = App.get_running_app() if App is not None else None
+                    if gui_app is not None:
+                        if success and hasattr(gui_app, 'notify_photo_captured'):
+                            Clock.schedule_once(lambda _dt, p=file_path: gui_app.notify_photo_captured(p), 0)
+                        elif not success and hasattr(gui_app, 'notify_capture_failed'):
+                            Clock.schedule_once(lambda _dt: gui_app.notify_capture_failed(), 0)
+                except Exception as exc_notify:
+                    logger.add_line(f'Failed to notify GUI about capture result: {exc_notify}')
+                # End GUI notification
+
+            @staticmethod
+            def _parse_chunk_query(query):
+                photo_id = _parse_single(query, 'id', 'no_id')
+                file_path = _parse_single(query, 'file_path', '')
+                offset_in_bytes = _parse_uint(_parse_single(query, 'offset_in_bytes', '0'), 0)
+                chunk_size_in_bytes = _parse_uint(_parse_single(query, 'chunk_size_in_bytes', '1048576'), 1048576)
+                return photo_id, file_path, offset_in_bytes, chunk_size_in_bytes
+
+            def _handle_get_file_chunk(self, query):
+                photo_id, file_path, offset_in_bytes, chunk_size_in_bytes = self._parse_chunk_query(query)
+                log_lines = [f'/get_file_chunk request: id={photo_id}, file_path={file_path}, offset={offset_in_bytes}, chunk_size={chunk_size_in_bytes}']
+                response_bytes = api_interface.get_file_chunk_response(photo_id, file_path, offset_in_bytes, chunk_size_in_bytes, log_lines)
+                log_response = response_bytes[:500].decode('utf-8', errors='replace')
+                logger.add_line(f'/get_file_chunk response: {log_response}')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(response_bytes)))
+                self.end_headers()
+                self.wfile.write(response_bytes)
+
+            def _handle_get_img(self, query):
+                photo_id = _parse_single(query, 'id', 'no_id')
+                file_name = _parse_single(query, 'file_name', '')
+                log_lines = [f'/get_img request: id={photo_id}, file_name={file_name}']
+                # Resolve dummy file path (read from ini if present, cached until the ini changes)
+                dummy_file_path = api_interface._get_dummy_file_path()
+                # Build the requested file path
+                requested_path = os.path.abspath(os.path.join(api_interface._photo_folder, file_name))
+                # Security: ensure requested_path is inside photo_folder
+                if not api_interface._is_in_photo_folder(requested_path):
+                    log_lines.append(f'/get_img: Access denied for file_name={file_name}')
+                    requested_path = dummy_file_path
+                # Try to serve the file, fallback to dummy if not found
+                file_to_serve = requested_path
+                if not os.path.isfile(file_to_serve):
+                    log_lines.append(f'/get_img: File not found, serving dummy: {file_to_serve}')
+                    file_to_serve = dummy_file_path
+                logger.add_lines(log_lines)
+                try:
+                    with open(file_to_serve, 'rb') as f:
+                        file_size = os.fstat(f.fileno()).st_size
+                        _advise_sequential(f.fileno())
+                        # Guess content type by extension
+                        content_type, _ = mimetypes.guess_type(file_to_serve)
+                        if not content_type:
+                            content_type = 'application/octet-stream'
                         self.send_response(200)
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(response_bytes)))
-                        self.end_headers()
-                        self.wfile.write(response_bytes)
-                    elif parsed.path == '/get_img':
-                        qs = parse_qs(parsed.query)
-                        photo_id = qs.get('id', ['no_id'])[0]
-                        file_name = qs.get('file_name', [''])[0]
-                        logger.add_line(f'/get_img request: id={photo_id}, file_name={file_name}')
-                        # Resolve photo folder and dummy file path
-                        import os
-                        photo_folder = getattr(camera_handler, 'photo_folder_path', os.path.join(os.getcwd(), 'photos'))
-                        ini_path = os.path.abspath('DroidEye.ini')
-                        ini_dir = os.path.dirname(ini_path)
-                        dummy_file_path = os.path.join(ini_dir, 'dummy.jpg')
-                        # Try to read dummy_file_path from ini if present
-                        import configparser
-                        config = configparser.ConfigParser()
-                        config.read(ini_path)
-                        dummy_file_path = config['DEFAULT'].get('dummy_file_path', dummy_file_path)
-                        # Build the requested file path
-                        requested_path = os.path.abspath(os.path.join(photo_folder, file_name))
-                        # Security: ensure requested_path is inside photo_folder
-                        if not requested_path.startswith(os.path.abspath(photo_folder) + os.sep):
-                            logger.add_line(f'/get_img: Access denied for file_name={file_name}')
-                            requested_path = dummy_file_path
-                        # Try to serve the file, fallback to dummy if not found
-                        file_to_serve = requested_path
-                        if not os.path.isfile(file_to_serve):
-                            logger.add_line(f'/get_img: File not found, serving dummy: {file_to_serve}')
-                            file_to_serve = dummy_file_path
-                        try:
-                            with open(file_to_serve, 'rb') as f:
-                                img_bytes = f.read()
-                            # Guess content type by extension
-                            import mimetypes
-                            content_type, _ = mimetypes.guess_type(file_to_serve)
-                            if not content_type:
-                                content_type = 'application/octet-stream'
-                            self.send_response(200)
-                            self.send_header('Content-Type', content_type)
-                            self.send_header('Content-Length', str(len(img_bytes)))
-                            self.end_headers()
-                            self.wfile.write(img_bytes)
-                        except Exception as exc:
-                            logger.add_line(f'/get_img: Error serving file: {exc}')
-                            self.send_response(500)
-                            self.end_headers()
-                            self.wfile.write(b'Internal Server Error')
-                    else:
-                        self.send_response(404)
+                        self.send_header('Content-Type', content_type)
+                        self.send_header('Content-Length', str(file_size))
                         self.end_headers()
+                        self._send_file(f, file_size)
                 except Exception as exc:
-                    logger.add_line(f'Error handling request: {exc}')
-                    self.send_response(500)
+                    logger.add_line(f'/get_img: Error serving file: {exc}')
+                    self._send_plain(500, b'Internal Server Error')
+
+            def _handle_get_file_chunk_raw(self, query):
+                photo_id, file_path, offset_in_bytes, chunk_size_in_bytes = self._parse_chunk_query(query)
+                log_lines = [f'/get_file_chunk_raw request: id={photo_id}, file_path={file_path}, offset={offset_in_bytes}, chunk_size={chunk_size_in_bytes}']
+                abs_file_path = os.path.abspath(file_path)
+                if not api_interface._is_in_photo_folder(abs_file_path):
+                    message = f'Access denied: file_path not in allowed photo folder ({api_interface._abs_photo_folder})'
+                    log_lines.append(message)
+                    logger.add_lines(log_lines)
+                    self._send_plain(403, message.encode('utf-8'))
+                    return
+                try:
+                    f = open(abs_file_path, 'rb')
+                except OSError as exc:
+                    message = f'Error reading file: {exc}'
+                    log_lines.append(message)
+                    logger.add_lines(log_lines)
+                    self._send_plain(404, message.encode('utf-8'))
+                    return
+                with f:
+                    file_size = os.fstat(f.fileno()).st_size
+                    offset_in_bytes = min(max(offset_in_bytes, 0), file_size)
+                    chunk_len = max(0, min(chunk_size_in_bytes, file_size - offset_in_bytes))
+                    is_last_chunk = offset_in_bytes + chunk_len >= file_size
+                    _advise_sequential(f.fileno(), offset_in_bytes, chunk_len)
+                    # Metadata travels in headers, the body is the raw chunk (no base64/JSON)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/octet-stream')
+                    self.send_header('Content-Length', str(chunk_len))
+                    self.send_header('X-File-Size', str(file_size))
+                    self.send_header('X-Offset', str(offset_in_bytes))
+                    self.send_header('X-Is-Last-Chunk', 'true' if is_last_chunk else 'false')
                     self.end_headers()
-                    self.wfile.write(b'Internal Server Error')
+                    self._send_file(f, chunk_len, offset_in_bytes)
+                log_lines.append(f'/get_file_chunk_raw response: {chunk_len} bytes, file_size={file_size}, is_last_chunk={is_last_chunk}')
+                logger.add_lines(log_lines)
+
+            # Path -> handler, looked up once per request instead of an if/elif chain
+            _ROUTES = {
+                '/capture': _handle_capture,
+                '/get_file_chunk': _handle_get_file_chunk,
+                '/get_file_chunk_raw': _handle_get_file_chunk_raw,
+                '/get_img': _handle_get_img,
+            }
+
+            def _send_plain(self, code, body=b''):
+                # Errors may happen half-way through a response, so never reuse the connection after one
+                if code >= 500:
+                    self.close_connection = True
+                self.send_response(code)
+                if body:
+                    self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def _send_file(self, f, count, offset=0):
+                """Stream count bytes of file f starting at offset with sendfile(2).
+
+                socket.sendfile() waits for the socket itself (the handler timeout makes it
+                non-blocking underneath) and copies through user space only where sendfile(2)
+                is unavailable.
+                """
+                if count <= 0:
+                    return
+                self.wfile.flush()
+                self.connection.sendfile(f, offset, count)
 
             def log_message(self, format, *args):  # noqa: N802, pylint: disable=invalid-name
                 # Silence default HTTP server logging
@@ -152,77 +334,118 @@ class ApiInterface:
         # Create and run server
         # ------------------------------------------------------------------
         try:
-            httpd = HTTPServer(('0.0.0.0', self.port), RequestHandler)
+            httpd = ThreadingHTTPServer(('0.0.0.0', self.port), RequestHandler)
             logger.add_line(f'HTTP API started on port {self.port}')
             httpd.serve_forever()
         except Exception as exc:
             logger.add_line(f'HTTP API failed/stopped: {exc}') 
 
-    def get_file_chunk_response(self, photo_id, file_path, offset_in_bytes, chunk_size_in_bytes):
-        import os, html
+    def get_file_chunk_response(self, photo_id, file_path, offset_in_bytes, chunk_size_in_bytes, log_lines=None) -> bytes:
+        """Build the encoded JSON body for /get_file_chunk.
+
+        Pending log_lines (e.g. the request line) are extended with any error message
+        and added in one go before the log tail is taken, so the response's log keeps them in order.
+        """
         logger = self.logger
-        camera_handler = self.camera_handler
-        allowed_folder = os.path.abspath(getattr(camera_handler, 'photo_folder_path', '.'))
+        if log_lines is None:
+            log_lines = []
+        allowed_folder = self._abs_photo_folder
         abs_file_path = os.path.abspath(file_path)
-        if not abs_file_path.startswith(allowed_folder + os.sep):
+        if not self._is_in_photo_folder(abs_file_path):
             message = f'Access denied: file_path not in allowed photo folder ({allowed_folder})'
-            logger.add_line(message)
-            return {
-                'has_error': True,
-                'message': html.escape(message),
-                'id': photo_id,
-                'file_size_in_bytes': 0,
-                'file_path': file_path,
-                'is_last_chunk': True,
-                'offset_in_bytes': offset_in_bytes,
-                'chunk_size_in_bytes': chunk_size_in_bytes,
-                'chunk_body_as_base64': '',
-                'log': html.escape(logger.get_body())
-            }
+            log_lines.append(message)
+            logger.add_lines(log_lines)
+            return _encode_chunk_response(True, message, photo_id, 0, file_path, True,
+                                          offset_in_bytes, chunk_size_in_bytes, b'', logger.get_tail(_RESPONSE_LOG_LINES))
         try:
-            file_size = os.path.getsize(abs_file_path)
+            # The same stat result also validates the cached mmap in get_file_chunk
+            st = os.stat(abs_file_path)
+            file_size = st.st_size
         except Exception as exc:
             message = f'Error reading file size: {exc}'
-            logger.add_line(message)
-            return {
-                'has_error': True,
-                'message': html.escape(message),
-                'id': photo_id,
-                'file_size_in_bytes': 0,
-                'file_path': file_path,
-                'is_last_chunk': True,
-                'offset_in_bytes': offset_in_bytes,
-                'chunk_size_in_bytes': chunk_size_in_bytes,
-                'chunk_body_as_base64': '',
-                'log': html.escape(logger.get_body())
-            }
-        has_error, message, is_last_chunk, chunk_body_as_base64 = self.get_file_chunk(abs_file_path, offset_in_bytes, chunk_size_in_bytes, file_size)
-        return {
-            'has_error': has_error,
-            'message': html.escape(message),
-            'id': photo_id,
-            'file_size_in_bytes': file_size,
-            'file_path': file_path,
-            'is_last_chunk': is_last_chunk,
-            'offset_in_bytes': offset_in_bytes,
-            'chunk_size_in_bytes': chunk_size_in_bytes,
-            'chunk_body_as_base64': chunk_body_as_base64,
-            'log': html.escape(logger.get_body())
-        }
-
-    def get_file_chunk(self, abs_file_path, offset_in_bytes, chunk_size_in_bytes, file_size):
-        import base64
+            log_lines.append(message)
+            logger.add_lines(log_lines)
+            return _encode_chunk_response(True, message, photo_id, 0, file_path, True,
+                                          offset_in_bytes, chunk_size_in_bytes, b'', logger.get_tail(_RESPONSE_LOG_LINES))
+        has_error, message, is_last_chunk, chunk_body_as_base64 = self.get_file_chunk(abs_file_path, offset_in_bytes, chunk_size_in_bytes, file_size, st)
+        logger.add_lines(log_lines)
+        return _encode_chunk_response(has_error, message, photo_id, file_size, file_path, is_last_chunk,
+                                      offset_in_bytes, chunk_size_in_bytes, chunk_body_as_base64,
+                                      logger.get_tail(_RESPONSE_LOG_LINES))
+
+    def get_file_chunk(self, abs_file_path, offset_in_bytes, chunk_size_in_bytes, file_size, st=None):
         try:
-            with open(abs_file_path, 'rb') as f:
-                f.seek(offset_in_bytes)
-                chunk = f.read(chunk_size_in_bytes)
-            chunk_body_as_base64 = base64.b64encode(chunk).decode('ascii')
-            is_last_chunk = (offset_in_bytes + len(chunk) >= file_size)
+            if offset_in_bytes < 0:
+                raise ValueError(f'negative offset_in_bytes: {offset_in_bytes}')
+            mm = self._get_mmap(abs_file_path, st)
+            if mm is None:
+                # Empty files cannot be mapped
+                chunk_body_as_base64 = b''
+                chunk_len = 0
+            else:
+                # The mapped file may have been truncated or rewritten in place since it was
+                # stat'ed; touching pages past its current end raises SIGBUS and kills the
+                # process, so never slice beyond what mm.size() (fstat of the mapping) reports.
+                mapped_size = mm.size()
+                if mapped_size != len(mm):
+                    self._drop_mmap(abs_file_path, mm)
+                end = max(offset_in_bytes, min(offset_in_bytes + chunk_size_in_bytes, file_size, mapped_size))
+                if end > offset_in_bytes and hasattr(mmap, 'MADV_WILLNEED'):
+                    # Prefetch the requested range (madvise needs a page-aligned start)
+                    start = offset_in_bytes - offset_in_bytes % mmap.PAGESIZE
+                    try:
+                        mm.madvise(mmap.MADV_WILLNEED, start, end - start)
+                    except (OSError, ValueError):
+                        pass
+                # Slice the page cache directly; b2a_base64 reads the memoryview without a copy
+                with memoryview(mm)[offset_in_bytes:end] as chunk:
+                    chunk_len = len(chunk)
+                    chunk_body_as_base64 = binascii.b2a_base64(chunk, newline=False)
+            is_last_chunk = (offset_in_bytes + chunk_len >= file_size)
             message = 'Ok'
             has_error = False
         except Exception as exc:
             message = f'Error reading file: {exc}'
-            chunk_body_as_base64 = ''
+            chunk_body_as_base64 = b''
             is_last_chunk = True
             has_error = True
-        return has_error, message, is_last_chunk, chunk_body_as_base64 
\ No newline at end of file
+        return has_error, message, is_last_chunk, chunk_body_as_base64
+
+    def _get_mmap(self, abs_file_path, st=None):
+        """Return a cached read-only mmap of the file, remapping it when it changed on disk.
+
+        st is the file's os.stat() result if the caller already has it. Returns None for empty files.
+        """
+        if st is None:
+            st = os.stat(abs_file_path)
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._mmap_lock:
+            entry = self._mmap_cache.get(abs_file_path)
+            if entry is not None and entry[0] == signature:
+                self._mmap_cache.move_to_end(abs_file_path)
+                return entry[1]
+        if st.st_size == 0:
+            return None
+        with open(abs_file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            # Chunked downloads walk the file front to back
+            try:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            except OSError:
+                pass
+        with self._mmap_lock:
+            self._mmap_cache[abs_file_path] = (signature, mm)
+            self._mmap_cache.move_to_end(abs_file_path)
+            while len(self._mmap_cache) > _MMAP_CACHE_SIZE:
+                # Evicted maps are not closed explicitly: another request may still be
+                # slicing them, they get unmapped once the last reference is dropped.
+                self._mmap_cache.popitem(last=False)
+        return mm
+
+    def _drop_mmap(self, abs_file_path, mm):
+        """Forget the cached map of abs_file_path if it is still mm, so the next request maps the file again."""
+        with self._mmap_lock:
+            entry = self._mmap_cache.get(abs_file_path)
+            if entry is not None and entry[1] is mm:
+                del self._mmap_cache[abs_file_path]
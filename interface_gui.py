@@ -1,7 +1,14 @@
-import urllib.request
+from collections import deque
+import http.client
+import select
 import threading
 import os
 
+try:
+    from orjson import loads as _json_loads  # optional, faster than stdlib json
+except ImportError:
+    from json import loads as _json_loads
+
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
@@ -12,6 +19,9 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
 from kivy.metrics import dp
 
+# Lines kept in the on-screen log; older ones are still in CsLog and the log file
+_LOG_VIEW_MAX_LINES = 2000
+
 
 class DroidEyeApp(App):
     """Kivy GUI for DroidEye."""
@@ -23,6 +33,10 @@ class DroidEyeApp(App):
         self.preview_last_photo = preview_last_photo
         self.capture_timeout = capture_timeout
         self.lines_processed = 0
+        self._log_buffer = deque(maxlen=_LOG_VIEW_MAX_LINES)
+        # Kept-alive connection to the local API, reused across Test Capture clicks
+        self._conn = None
+        self._conn_lock = threading.Lock()
         self.last_photo_path = None
         self.photo_preview_widget = None
 
@@ -76,28 +90,29 @@ class DroidEyeApp(App):
         self.log_label.text_size = (None, None)
 
     def _refresh_log(self, _):
+        if self.logger.lines_count == self.lines_processed:
+            return
         new_lines = self.logger.get_new_lines(self.lines_processed)
         if not new_lines:
             return
         self.lines_processed += len(new_lines)
-        if self.log_label.text:
-            self.log_label.text += '\n' + '\n'.join(new_lines)
-        else:
-            self.log_label.text = '\n'.join(new_lines)
+        # Only the most recent lines are rendered, so each tick costs O(window) not O(whole log)
+        self._log_buffer.extend(new_lines)
+        self.log_label.text = '\n'.join(self._log_buffer)
         self.log_label.texture_update()
         # Auto scroll to bottom
         self.scroll_view.scroll_y = 0
 
     def _on_capture(self, _):
-        url = f'http://127.0.0.1:{self.port}/capture?id=UiTest'
-        self.logger.add_line(f'Sending capture request to {url}')
+        path = '/capture?id=UiTest'
+        self.logger.add_line(f'Sending capture request to http://127.0.0.1:{self.port}{path}')
 
         # Run the blocking HTTP call in a background thread so the UI remains responsive.
         def _worker():
             try:
-                with urllib.request.urlopen(url, timeout=self.capture_timeout) as resp:
-                    response_body = resp.read()
-                    response_text = response_body.decode('utf-8', errors='replace')
+                with self._conn_lock:
+                    response_body = self._request_capture(path)
+                response_text = response_body.decode('utf-8', errors='replace')
             except Exception as exc:
                 from kivy.clock import Clock
                 Clock.schedule_once(lambda *_: self.logger.add_line(f'Capture request failed: {exc}'), 0)
@@ -109,6 +124,35 @@ class DroidEyeApp(App):
 
         threading.Thread(target=_worker, daemon=True).start()
 
+    def _request_capture(self, path: str) -> bytes:
+        """GET path on the local API over the persistent connection (caller holds _conn_lock)."""
+        conn = self._conn
+        if conn is not None and (conn.sock is None or select.select([conn.sock], [], [], 0)[0]):
+            # An idle kept-alive socket only becomes readable when the server closed it
+            conn.close()
+            conn = self._conn = None
+        for attempt in range(2):
+            reused = conn is not None
+            if conn is None:
+                conn = self._conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.capture_timeout)
+            try:
+                conn.request('GET', path)
+            except OSError:
+                conn.close()
+                conn = self._conn = None
+                # Only a reused connection failing while sending is retried: the server has
+                # not seen the request, so no second capture can be triggered
+                if attempt or not reused:
+                    raise
+                continue
+            try:
+                return conn.getresponse().read()
+            except Exception:
+                # The server may already be capturing – never resend /capture
+                conn.close()
+                self._conn = None
+                raise
+
     # ------------------------------------------------------------------
     # Internal helpers – async response processing
     # ------------------------------------------------------------------
@@ -122,8 +166,7 @@ class DroidEyeApp(App):
 
         self.logger.add_line('Photo preview enabled, processing response…')
         try:
-            import json
-            data = json.loads(response_body.decode('utf-8'))
+            data = _json_loads(response_body)
             self.logger.add_line(f'Response parsed successfully, has_error={data.get("has_error", False)}')
             if 'file_path' in data and not data.get('has_error', False):
                 self.last_photo_path = data['file_path']
@@ -18,16 +18,18 @@ def load_config(ini_path: str = 'DroidEye.ini'):
     photo_folder_path = default.get('photo_folder_path', 'default')
     wait_x_seconds_on_ui_capture = int(default.get('wait_x_seconds_on_ui_capture', 60))
     preview_last_photo = default.getboolean('preview_last_photo', False)
-    return port, photo_folder_path, wait_x_seconds_on_ui_capture, preview_last_photo
+    reencode_captured_photo = default.getboolean('reencode_captured_photo', False)
+    debug_log = default.getboolean('debug_log', False)
+    return port, photo_folder_path, wait_x_seconds_on_ui_capture, preview_last_photo, reencode_captured_photo, debug_log
 
 
 def main():
     # Read configuration
-    port, photo_folder_path, wait_x_seconds_on_ui_capture, preview_last_photo = load_config()
+    port, photo_folder_path, wait_x_seconds_on_ui_capture, preview_last_photo, reencode_captured_photo, debug_log = load_config()
 
     # Initialise logging
-    log = CsLog('---------------------------------- DroidEye started ----------------------------------', 'DroidEye.log')
-    log.add_line(f'Config loaded: port={port}, photo_folder_path={photo_folder_path}, wait_x_seconds_on_ui_capture={wait_x_seconds_on_ui_capture}, preview_last_photo={preview_last_photo}')
+    log = CsLog('---------------------------------- DroidEye started ----------------------------------', 'DroidEye.log', debug_log)
+    log.add_line(f'Config loaded: port={port}, photo_folder_path={photo_folder_path}, wait_x_seconds_on_ui_capture={wait_x_seconds_on_ui_capture}, preview_last_photo={preview_last_photo}, reencode_captured_photo={reencode_captured_photo}, debug_log={debug_log}')
 
     # ------------------------------------------------------------------
     # Global exception handling: capture any uncaught exception (main
@@ -57,7 +59,7 @@ def main():
     threading.excepthook = _thread_exception_handler
 
     # Prepare camera handler
-    camera_handler = CameraHandler(photo_folder_path, log, wait_x_seconds_on_ui_capture)
+    camera_handler = CameraHandler(photo_folder_path, log, wait_x_seconds_on_ui_capture, reencode_captured_photo)
 
     # Start HTTP API server in background thread
     api_server = ApiInterface(port, camera_handler, log)
@@ -70,6 +72,7 @@ def main():
 
     # Run Kivy GUI (blocks until exit)
     DroidEyeApp(log, port, preview_last_photo, wait_x_seconds_on_ui_capture).run()
+    camera_handler.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+
+from handler_for_CsLog import CsLog
+
+
+class CsLogBodyTest(unittest.TestCase):
+
+    def setUp(self):
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def test_body_is_cached_until_next_append(self):
+        log = CsLog()
+        self.assertEqual(log.body, '')
+        log.add_line('first')
+        body = log.body
+        self.assertIs(log.body, body)
+        log.add_lines(['second', 'third'])
+        self.assertIsNot(log.body, body)
+        self.assertEqual([line.split(' ', 2)[2] for line in log.body.splitlines()], ['first', 'second', 'third'])
+        self.assertEqual(log.get_body(), log.body)
+
+
+class CsLogCloseTest(unittest.TestCase):
+
+    def setUp(self):
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log_file_path = os.path.join(tmp.name, 'test.log')
+
+    def read_log_file(self):
+        with open(self.log_file_path) as log_file:
+            return log_file.read()
+
+    def test_lines_added_after_close_reach_the_file(self):
+        log = CsLog('before close', self.log_file_path)
+        log.close()
+        log.add_line('after close')
+        log.add_lines(['after close 2'])
+        self.assertEqual(self.read_log_file(), log.body)
+        self.assertEqual(len(log.body.splitlines()), 3)
+
+    def test_lines_racing_with_close_are_not_lost(self):
+        log = CsLog(log_file_path=self.log_file_path)
+        start = threading.Barrier(5)
+
+        def add_many(n):
+            start.wait()
+            for i in range(500):
+                log.add_line(f'thread {n} line {i}')
+
+        threads = [threading.Thread(target=add_many, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        log.close()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.read_log_file(), log.body)
+        self.assertEqual(log.lines_count, 4 * 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import base64
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+from handler_for_CsLog import CsLog
+from interface_api import ApiInterface, _parse_uint
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class ApiServerTestCase(unittest.TestCase):
+    """Runs the real HTTP API on a free local port against a temporary photo folder."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.photo_folder = cls._tmp.name
+        cls.port = _free_port()
+        camera_handler = types.SimpleNamespace(photo_folder_path=cls.photo_folder, wait_x_seconds_on_ui_capture=1)
+        cls.api = ApiInterface(cls.port, camera_handler, CsLog())
+        threading.Thread(target=cls.api.start, daemon=True).start()
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', cls.port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def get(self, path):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            return response, response.read()
+        finally:
+            conn.close()
+
+    def write_photo(self, name, data):
+        path = os.path.join(self.photo_folder, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+
+class RoutingTest(ApiServerTestCase):
+
+    def test_origin_form(self):
+        response, _ = self.get('/get_file_chunk_raw?id=t&file_path=/etc/passwd')
+        self.assertEqual(response.status, 403)
+
+    def test_absolute_form(self):
+        response, _ = self.get(f'http://127.0.0.1:{self.port}/get_file_chunk_raw?id=t&file_path=/etc/passwd')
+        self.assertEqual(response.status, 403)
+
+    def test_fragment_is_ignored(self):
+        data = b'abc'
+        path = self.write_photo('fragment.jpg', data)
+        response, body = self.get(f'/get_file_chunk_raw?id=t&file_path={path}#top')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, data)
+        response, _ = self.get('/get_img#top')
+        self.assertEqual(response.status, 200)
+
+    def test_unknown_path(self):
+        response, _ = self.get('/nope')
+        self.assertEqual(response.status, 404)
+
+
+class ParseUintTest(unittest.TestCase):
+
+    def test_digits(self):
+        self.assertEqual(_parse_uint('524288', 0), 524288)
+
+    def test_invalid_values_fall_back_to_default(self):
+        for raw in ('', '-5', '+5', ' 5', '1.5', 'abc', '9' * 19):
+            self.assertEqual(_parse_uint(raw, 7), 7, raw)
+
+    def test_oversized_value_does_not_raise(self):
+        # Longer than int()'s default digit limit (4300)
+        self.assertEqual(_parse_uint('1' * 5000, 7), 7)
+
+
+class GetFileChunkQueryTest(ApiServerTestCase):
+
+    def test_oversized_offset_falls_back_to_default(self):
+        data = b'0123456789'
+        path = self.write_photo('small.jpg', data)
+        response, body = self.get(f'/get_file_chunk?id=t&file_path={path}&offset_in_bytes={"1" * 5000}')
+        self.assertEqual(response.status, 200)
+        result = json.loads(body)
+        self.assertFalse(result['has_error'])
+        self.assertEqual(result['offset_in_bytes'], 0)
+        self.assertEqual(result['file_size_in_bytes'], len(data))
+
+
+class GetFileChunkRawTest(ApiServerTestCase):
+
+    def test_access_denied_is_plain_text(self):
+        response, body = self.get('/get_file_chunk_raw?id=t&file_path=/etc/passwd')
+        self.assertEqual(response.status, 403)
+        self.assertEqual(response.getheader('Content-Type'), 'text/plain; charset=utf-8')
+        self.assertIn(b'Access denied', body)
+
+    def test_missing_file_is_plain_text(self):
+        missing = os.path.join(self.photo_folder, 'missing.jpg')
+        response, body = self.get(f'/get_file_chunk_raw?id=t&file_path={missing}')
+        self.assertEqual(response.status, 404)
+        self.assertEqual(response.getheader('Content-Type'), 'text/plain; charset=utf-8')
+        self.assertIn(b'Error reading file', body)
+
+    def test_chunk(self):
+        data = os.urandom(1000)
+        path = self.write_photo('raw.jpg', data)
+        response, body = self.get(f'/get_file_chunk_raw?id=t&file_path={path}&offset_in_bytes=100&chunk_size_in_bytes=200')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, data[100:300])
+        self.assertEqual(response.getheader('X-File-Size'), '1000')
+        self.assertEqual(response.getheader('X-Is-Last-Chunk'), 'false')
+
+
+class MmapCacheTest(ApiServerTestCase):
+
+    def test_file_truncated_in_place_after_stat_is_not_read_past_its_end(self):
+        data = os.urandom(3 * 4096 * 4)
+        path = self.write_photo('rewritten.jpg', data)
+        st = os.stat(path)
+        has_error, _, _, chunk = self.api.get_file_chunk(path, 0, 4096, st.st_size, st)
+        self.assertFalse(has_error)
+        self.assertEqual(base64.b64decode(chunk), data[:4096])
+        # Rewritten in place (same inode) while still mapped, e.g. a recapture under the same name
+        with open(path, 'r+b') as f:
+            f.truncate(0)
+        # A request that stat'ed the file just before the truncation must not touch unbacked pages
+        has_error, _, _, chunk = self.api.get_file_chunk(path, 0, len(data), st.st_size, st)
+        self.assertFalse(has_error)
+        self.assertEqual(chunk, b'')
+        # The next request maps the file again
+        with open(path, 'r+b') as f:
+            f.write(b'new')
+        response, body = self.get(f'/get_file_chunk?id=t&file_path={path}')
+        self.assertEqual(base64.b64decode(json.loads(body)['chunk_body_as_base64']), b'new')
+
+
+@unittest.skipUnless(hasattr(os, 'sendfile'), 'sendfile(2) not available')
+class SendFileTest(ApiServerTestCase):
+
+    def test_large_file_is_sent_with_sendfile_only(self):
+        # Far larger than any socket send buffer, so a non-blocking socket hits EAGAIN
+        data = os.urandom(5 * 1024 * 1024)
+        self.write_photo('large.jpg', data)
+        real_sendfile = os.sendfile
+        sent_with_sendfile = []
+
+        def counting_sendfile(*args):
+            sent = real_sendfile(*args)
+            sent_with_sendfile.append(sent)
+            return sent
+
+        with mock.patch('os.sendfile', side_effect=counting_sendfile):
+            response, body = self.get('/get_img?id=t&file_name=large.jpg')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, data)
+        # Every byte went through sendfile(2), none through the user-space fallback
+        self.assertEqual(sum(sent_with_sendfile), len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()